@@ -5,18 +5,42 @@ A Flask API server that uses multiple free LLM APIs to generate country facts
 """
 
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import re
 import logging
 import time
+import threading
+from collections import OrderedDict
+from itertools import islice
+from types import MappingProxyType
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson for faster request parsing and jsonify"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=dict).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's UTF-8 bytes straight to the response, skipping a decode
+        obj = self._prepare_response_obj(args, kwargs)
+        # default=dict serializes the read-only MappingProxyType facts as objects
+        return self._app.response_class(orjson.dumps(obj, default=dict), mimetype="application/json")
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
 
 # Free LLM API configurations that actually work
@@ -41,178 +65,286 @@ LLM_PROVIDERS = [
     }
 ]
 
+# Free HuggingFace inference endpoints used for generation
+HF_DIALOGPT_URL = "https://api-inference.huggingface.co/models/microsoft/DialoGPT-medium"
+HF_GPT2_URL = "https://api-inference.huggingface.co/models/gpt2"
+
+# Models tried for fact generation, in order of preference
+HF_FACTS_MODELS = (
+    (HF_DIALOGPT_URL, "DialoGPT (HuggingFace)"),
+    (HF_GPT2_URL, "GPT-2 (HuggingFace)")
+)
+
+# (connect, read) timeouts for provider calls; a short connect timeout keeps
+# an unreachable endpoint from costing a full read timeout
+FACTS_TIMEOUT = (3.05, 30)
+CHAT_TIMEOUT = (3.05, 20)
+
+# Keep-alive session reused by every provider call to avoid a new TCP/TLS
+# handshake per request. Only a failed connect is retried, never a request
+# that may already have reached the model.
+HTTP_SESSION = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(total=1, connect=1, read=0, backoff_factor=0.1)
+)
+HTTP_SESSION.mount("http://", _http_adapter)
+HTTP_SESSION.mount("https://", _http_adapter)
+
+# Generation settings sent with every request; built once rather than per call
+FACTS_GENERATION_PARAMETERS = {
+    "max_length": 200,
+    "temperature": 0.7,
+    "do_sample": True
+}
+CHAT_GENERATION_PARAMETERS = {
+    "max_length": 150,
+    "temperature": 0.7,
+    "do_sample": True
+}
+
+# Exact-match cache of model responses, keyed on normalised country/question
+RESPONSE_CACHE_SIZE = 1024
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# Maximum number of countries accepted, and prompts sent to a provider, in one batched request
+MAX_BATCH_SIZE = 32
+
+# Patterns used by parse_facts_from_response, compiled once at import
+_NUMBERED_RE = re.compile(r'(\d+)\.\s*([^:\n]+?)[:.]?\s*(.+?)(?=\d+\.|$)', re.MULTILINE | re.DOTALL)
+_BULLET_RE = re.compile(r'[•\-\*]\s*([^:\n]+?)[:.]?\s*(.+?)(?=[•\-\*]|$)', re.MULTILINE | re.DOTALL)
+_SENTENCE_RE = re.compile(r'[^.!?]+')
+_WS_RE = re.compile(r'\s+')
+
+# Upper bound on how much model output gets scanned; the lazy, lookahead-driven
+# patterns above backtrack heavily on long inputs, and 3 facts never need more
+_MAX_PARSE_CHARS = 4000
+
+def make_cache_key(*parts):
+    """Normalise case and whitespace so trivially different inputs share an entry"""
+    return tuple(' '.join(part.lower().split()) for part in parts)
+
+def cache_get(key):
+    """Return a cached model response, or None on a miss"""
+    with _response_cache_lock:
+        value = _response_cache.get(key)
+        if value is not None:
+            _response_cache.move_to_end(key)
+        return value
+
+def cache_put(key, value):
+    """Store a model response, evicting the least recently used entry when full"""
+    with _response_cache_lock:
+        _response_cache[key] = value
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+def build_facts_prompt(country_name):
+    """Build the prompt asking a model for 3 numbered facts about a country"""
+    return f"Generate 3 interesting facts about {country_name}. Format as: 1. Fact one 2. Fact two 3. Fact three"
+
+def normalize_fact_content(content):
+    """Collapse whitespace (including newlines) and make sure the fact ends a sentence"""
+    content = _WS_RE.sub(' ', content).strip()
+    return content if content.endswith(('.', '!', '?')) else content + '.'
+
+def default_padding_facts(country_name, count):
+    """Generic facts used to top up a response that yielded fewer than 3"""
+    content = f"{country_name} has a rich history and culture worth exploring."
+    return [{"title": f"About {country_name}", "content": content} for _ in range(count)]
+
 def parse_facts_from_response(text, country_name):
-    """Parse the AI response and extract structured facts"""
+    """Parse the AI response into 3 facts, returning (facts, number found before padding)"""
     logger.info(f"Parsing response: {text[:200]}...")
     
-    facts = []
+    text = text[:_MAX_PARSE_CHARS]
     
-    # Try to find numbered facts (1., 2., 3.)
-    numbered_pattern = r'(\d+)\.\s*([^:\n]+?)[:.]?\s*(.+?)(?=\d+\.|$)'
-    matches = re.findall(numbered_pattern, text, re.MULTILINE | re.DOTALL)
+    # Try to find numbered facts (1., 2., 3.), then bullet points; only the
+    # first 3 matches are used, so stop scanning as soon as they are found
+    matches = [m.group(2, 3) for m in islice(_NUMBERED_RE.finditer(text), 3)]
+    if not matches:
+        matches = [m.groups() for m in islice(_BULLET_RE.finditer(text), 3)]
     
     if matches:
-        for i, (num, title, content) in enumerate(matches[:3]):
-            clean_content = content.strip().replace('\n', ' ')
-            facts.append({
-                "title": title.strip(),
-                "content": clean_content
-            })
+        facts = [
+            {"title": title.strip(), "content": normalize_fact_content(content)}
+            for title, content in matches
+        ]
     else:
-        # Try bullet points
-        bullet_pattern = r'[•\-\*]\s*([^:\n]+?)[:.]?\s*(.+?)(?=[•\-\*]|$)'
-        bullet_matches = re.findall(bullet_pattern, text, re.MULTILINE | re.DOTALL)
-        
-        if bullet_matches:
-            for i, (title, content) in enumerate(bullet_matches[:3]):
-                clean_content = content.strip().replace('\n', ' ')
-                facts.append({
-                    "title": title.strip(),
-                    "content": clean_content
-                })
-        else:
-            # Fallback: split by sentences and create facts
-            sentences = [s.strip() for s in re.split(r'[.!?]+', text) if len(s.strip()) > 20]
-            for i, sentence in enumerate(sentences[:3]):
-                facts.append({
-                    "title": f"Interesting Fact {i+1}",
-                    "content": sentence + "." if not sentence.endswith('.') else sentence
-                })
+        # Fallback: scan sentences lazily and stop once 3 long ones are found
+        sentences = (m.group().strip() for m in _SENTENCE_RE.finditer(text))
+        long_sentences = list(islice((s for s in sentences if len(s) > 20), 3))
+        facts = [
+            {"title": f"Interesting Fact {i+1}", "content": normalize_fact_content(sentence)}
+            for i, sentence in enumerate(long_sentences)
+        ]
     
     # Ensure we have exactly 3 facts
-    while len(facts) < 3:
-        facts.append({
-            "title": f"About {country_name}",
-            "content": f"{country_name} has a rich history and culture worth exploring."
-        })
+    matched = len(facts)
+    facts.extend(default_padding_facts(country_name, 3 - matched))
+    
+    return facts, matched
+
+def fetch_generated_text(url, payload, timeout):
+    """POST a prompt to a HuggingFace inference endpoint and return the generated text"""
+    response = HTTP_SESSION.post(url, json=payload, timeout=timeout)
     
-    return facts[:3]
+    if response.status_code == 200:
+        data = response.json()
+        if isinstance(data, list) and len(data) > 0:
+            return data[0].get('generated_text', '')
+    
+    return ''
 
 def try_huggingface_free(country_name):
-    """Try Hugging Face free inference API without API key"""
+    """Try Hugging Face free inference API without API key, returning (facts, model, matched)"""
     try:
-        # Use Microsoft Phi-2 which is available for free inference
-        url = "https://api-inference.huggingface.co/models/microsoft/DialoGPT-medium"
-        
-        prompt = f"Generate 3 interesting facts about {country_name}. Format as: 1. Fact one 2. Fact two 3. Fact three"
-        
         payload = {
-            "inputs": prompt,
-            "parameters": {
-                "max_length": 200,
-                "temperature": 0.7,
-                "do_sample": True
-            }
+            "inputs": build_facts_prompt(country_name),
+            "parameters": FACTS_GENERATION_PARAMETERS
         }
         
         logger.info("🤗 Trying Hugging Face free inference...")
-        response = requests.post(url, json=payload, timeout=30)
         
-        if response.status_code == 200:
-            data = response.json()
-            if isinstance(data, list) and len(data) > 0:
-                content = data[0].get('generated_text', '')
-                if content:
-                    facts = parse_facts_from_response(content, country_name)
-                    if facts and len(facts) > 0:
-                        return facts, "DialoGPT (HuggingFace)"
-        
-        # Try alternative free model
-        url2 = "https://api-inference.huggingface.co/models/gpt2"
-        response2 = requests.post(url2, json=payload, timeout=30)
-        
-        if response2.status_code == 200:
-            data2 = response2.json()
-            if isinstance(data2, list) and len(data2) > 0:
-                content = data2[0].get('generated_text', '')
-                if content:
-                    facts = parse_facts_from_response(content, country_name)
-                    if facts and len(facts) > 0:
-                        return facts, "GPT-2 (HuggingFace)"
+        # Try each free model in order of preference, moving on only when one fails
+        for url, model_name in HF_FACTS_MODELS:
+            try:
+                content = fetch_generated_text(url, payload, FACTS_TIMEOUT)
+            except Exception as e:
+                logger.info(f"{model_name} inference failed: {e}")
+                continue
+            
+            if content:
+                facts, matched = parse_facts_from_response(content, country_name)
+                if facts and len(facts) > 0:
+                    return facts, model_name, matched
                         
     except Exception as e:
         logger.info(f"HuggingFace free inference failed: {e}")
     
-    return None, None
+    return None, None, 0
+
+def try_huggingface_free_batch(country_names):
+    """Try Hugging Face free inference for several countries, one batched request per model"""
+    results = [(None, None, 0)] * len(country_names)
+    
+    for url, model_name in HF_FACTS_MODELS:
+        # Only countries the previous model couldn't answer go to the next one
+        pending = [i for i, (facts, _, _) in enumerate(results) if not facts]
+        if not pending:
+            break
+        
+        try:
+            payload = {
+                "inputs": [build_facts_prompt(country_names[i]) for i in pending],
+                "parameters": FACTS_GENERATION_PARAMETERS
+            }
+            
+            logger.info(f"🤗 Trying {model_name} for {len(pending)} countries...")
+            response = HTTP_SESSION.post(url, json=payload, timeout=FACTS_TIMEOUT)
+            
+            if response.status_code == 200:
+                data = response.json()
+                if isinstance(data, list) and len(data) == len(pending):
+                    for i, item in zip(pending, data):
+                        # Batched inputs come back as one list of generations per input
+                        if isinstance(item, list):
+                            item = item[0] if item else {}
+                        content = item.get('generated_text', '') if isinstance(item, dict) else ''
+                        if content:
+                            facts, matched = parse_facts_from_response(content, country_names[i])
+                            if facts and len(facts) > 0:
+                                results[i] = (facts, model_name, matched)
+                            
+        except Exception as e:
+            logger.info(f"{model_name} batch inference failed: {e}")
+    
+    return results
+
+def freeze_facts(facts):
+    """Return a read-only copy of a list of facts, safe to share between requests"""
+    return tuple(MappingProxyType(dict(fact)) for fact in facts)
+
+# Enhanced knowledge base with more interesting facts
+_CURATED_FACTS = {
+    'japan': (
+        {"title": "Vending Machine Paradise", "content": "Japan has over 5 million vending machines, selling everything from hot coffee to fresh flowers - that's one vending machine for every 25 people!"},
+        {"title": "Ancient Meets Modern", "content": "Japan has the world's oldest continuous monarchy, with Emperor Naruhito being the 126th emperor in an unbroken line dating back over 2,600 years."},
+        {"title": "Island Nation Complexity", "content": "Japan consists of 6,852 islands, though only about 430 are inhabited, making it one of the most geographically complex countries in the world."}
+    ),
+    'france': (
+        {"title": "Cheese Champion", "content": "France produces over 350 types of cheese, and it's said that you could eat a different French cheese every day for an entire year!"},
+        {"title": "Most Visited Country", "content": "France is the world's most visited country, welcoming over 89 million tourists annually - more than its entire population!"},
+        {"title": "Time Zone Record", "content": "France spans 12 different time zones, more than any other country, due to its overseas territories around the globe."}
+    ),
+    'brazil': (
+        {"title": "Amazon Powerhouse", "content": "Brazil contains about 60% of the Amazon rainforest, which produces approximately 20% of the world's oxygen."},
+        {"title": "Coffee King", "content": "Brazil has been the world's largest coffee producer for over 150 years, producing about one-third of all coffee globally."},
+        {"title": "Carnival Capital", "content": "Rio de Janeiro's Carnival is the world's largest carnival celebration, attracting over 2 million people daily during the festival."}
+    ),
+    'germany': (
+        {"title": "Engineering Excellence", "content": "Germany is home to the Autobahn highway system, parts of which have no speed limits, and the country produces some of the world's most advanced automobiles."},
+        {"title": "Festival Culture", "content": "Germany hosts Oktoberfest, the world's largest beer festival, where over 6 million people consume around 7 million liters of beer annually."},
+        {"title": "Innovation Hub", "content": "Germany has produced more Nobel Prize winners in science than any other country except the United States, with over 100 laureates."}
+    ),
+    'italy': (
+        {"title": "Pasta Perfection", "content": "Italy has over 350 different pasta shapes, each designed to pair perfectly with specific sauces and regional ingredients."},
+        {"title": "UNESCO Champion", "content": "Italy has the most UNESCO World Heritage Sites of any country with 58 sites, showcasing its incredible historical and cultural wealth."},
+        {"title": "Volcano Land", "content": "Italy has three active volcanoes: Mount Etna, Stromboli, and Mount Vesuvius, with Mount Etna being Europe's most active volcano."}
+    ),
+    'spain': (
+        {"title": "Flamenco Heritage", "content": "Spain is the birthplace of flamenco, a passionate art form combining guitar, singing, dancing, and handclaps that originated in Andalusia."},
+        {"title": "Architectural Wonders", "content": "Spain features incredible architecture from the Sagrada Família (still under construction after 140+ years) to the Alhambra's intricate Islamic art."},
+        {"title": "Siesta Tradition", "content": "The Spanish siesta tradition exists because Spain is geographically positioned to have the same time zone as Central Europe, making midday extremely hot."}
+    ),
+    'canada': (
+        {"title": "Freshwater Giant", "content": "Canada has more freshwater than any other country, containing about 20% of the world's fresh water in its lakes and rivers."},
+        {"title": "Maple Syrup Monopoly", "content": "Canada produces 71% of the world's maple syrup, with Quebec alone accounting for 90% of Canada's production."},
+        {"title": "Coastline Champion", "content": "Canada has the world's longest coastline at 202,080 kilometers, longer than the coastlines of all other countries combined!"}
+    ),
+    'australia': (
+        {"title": "Unique Wildlife", "content": "Australia is home to more than 80% of animals and plants that exist nowhere else on Earth, including kangaroos, koalas, and the platypus."},
+        {"title": "Massive Country", "content": "Australia is the 6th largest country by land area but has a population of only 26 million people, making it one of the least densely populated countries."},
+        {"title": "Great Barrier Reef", "content": "The Great Barrier Reef is the world's largest coral reef system and can be seen from space - it's larger than the Great Wall of China!"}
+    ),
+    'egypt': (
+        {"title": "Ancient Wonder", "content": "The Great Pyramid of Giza was the tallest man-made structure in the world for over 3,800 years until the Eiffel Tower was built."},
+        {"title": "Nile Lifeline", "content": "The Nile River, flowing through Egypt, is the longest river in the world at 4,135 miles and has been Egypt's lifeline for over 5,000 years."},
+        {"title": "Hieroglyphic Legacy", "content": "Ancient Egyptians used over 700 different hieroglyphic symbols, and the Rosetta Stone was the key to deciphering this ancient writing system."}
+    ),
+    'india': (
+        {"title": "Language Diversity", "content": "India recognizes 22 official languages and has over 1,600 spoken languages, making it one of the most linguistically diverse countries on Earth."},
+        {"title": "Spice Origin", "content": "India is known as the 'Spice Bowl of the World' and produces 70% of the world's spices, including black pepper, cardamom, and turmeric."},
+        {"title": "Chess Birthplace", "content": "Chess was invented in India around the 6th century AD, originally called 'Chaturanga,' meaning 'four divisions of the army.'"}
+    )
+}
+COUNTRY_FACTS = MappingProxyType({country: freeze_facts(facts) for country, facts in _CURATED_FACTS.items()})
+
+# Title/content templates used for countries without curated facts
+GENERIC_FACT_TEMPLATES = (
+    ("Geographic Uniqueness", "{country} has distinctive geographical features that have shaped its culture, climate, and way of life throughout history."),
+    ("Cultural Heritage", "The people of {country} have developed unique traditions, languages, and customs that reflect their rich historical heritage and regional influences."),
+    ("Global Contribution", "{country} has made significant contributions to world culture, science, art, or international relations that continue to influence global society today.")
+)
 
 def generate_intelligent_facts(country_name):
     """Generate intelligent facts using built-in knowledge"""
     logger.info("🧠 Using intelligent fact generation...")
     
-    # Enhanced knowledge base with more interesting facts
-    country_facts = {
-        'japan': [
-            {"title": "Vending Machine Paradise", "content": "Japan has over 5 million vending machines, selling everything from hot coffee to fresh flowers - that's one vending machine for every 25 people!"},
-            {"title": "Ancient Meets Modern", "content": "Japan has the world's oldest continuous monarchy, with Emperor Naruhito being the 126th emperor in an unbroken line dating back over 2,600 years."},
-            {"title": "Island Nation Complexity", "content": "Japan consists of 6,852 islands, though only about 430 are inhabited, making it one of the most geographically complex countries in the world."}
-        ],
-        'france': [
-            {"title": "Cheese Champion", "content": "France produces over 350 types of cheese, and it's said that you could eat a different French cheese every day for an entire year!"},
-            {"title": "Most Visited Country", "content": "France is the world's most visited country, welcoming over 89 million tourists annually - more than its entire population!"},
-            {"title": "Time Zone Record", "content": "France spans 12 different time zones, more than any other country, due to its overseas territories around the globe."}
-        ],
-        'brazil': [
-            {"title": "Amazon Powerhouse", "content": "Brazil contains about 60% of the Amazon rainforest, which produces approximately 20% of the world's oxygen."},
-            {"title": "Coffee King", "content": "Brazil has been the world's largest coffee producer for over 150 years, producing about one-third of all coffee globally."},
-            {"title": "Carnival Capital", "content": "Rio de Janeiro's Carnival is the world's largest carnival celebration, attracting over 2 million people daily during the festival."}
-        ],
-        'germany': [
-            {"title": "Engineering Excellence", "content": "Germany is home to the Autobahn highway system, parts of which have no speed limits, and the country produces some of the world's most advanced automobiles."},
-            {"title": "Festival Culture", "content": "Germany hosts Oktoberfest, the world's largest beer festival, where over 6 million people consume around 7 million liters of beer annually."},
-            {"title": "Innovation Hub", "content": "Germany has produced more Nobel Prize winners in science than any other country except the United States, with over 100 laureates."}
-        ],
-        'italy': [
-            {"title": "Pasta Perfection", "content": "Italy has over 350 different pasta shapes, each designed to pair perfectly with specific sauces and regional ingredients."},
-            {"title": "UNESCO Champion", "content": "Italy has the most UNESCO World Heritage Sites of any country with 58 sites, showcasing its incredible historical and cultural wealth."},
-            {"title": "Volcano Land", "content": "Italy has three active volcanoes: Mount Etna, Stromboli, and Mount Vesuvius, with Mount Etna being Europe's most active volcano."}
-        ],
-        'spain': [
-            {"title": "Flamenco Heritage", "content": "Spain is the birthplace of flamenco, a passionate art form combining guitar, singing, dancing, and handclaps that originated in Andalusia."},
-            {"title": "Architectural Wonders", "content": "Spain features incredible architecture from the Sagrada Família (still under construction after 140+ years) to the Alhambra's intricate Islamic art."},
-            {"title": "Siesta Tradition", "content": "The Spanish siesta tradition exists because Spain is geographically positioned to have the same time zone as Central Europe, making midday extremely hot."}
-        ],
-        'canada': [
-            {"title": "Freshwater Giant", "content": "Canada has more freshwater than any other country, containing about 20% of the world's fresh water in its lakes and rivers."},
-            {"title": "Maple Syrup Monopoly", "content": "Canada produces 71% of the world's maple syrup, with Quebec alone accounting for 90% of Canada's production."},
-            {"title": "Coastline Champion", "content": "Canada has the world's longest coastline at 202,080 kilometers, longer than the coastlines of all other countries combined!"}
-        ],
-        'australia': [
-            {"title": "Unique Wildlife", "content": "Australia is home to more than 80% of animals and plants that exist nowhere else on Earth, including kangaroos, koalas, and the platypus."},
-            {"title": "Massive Country", "content": "Australia is the 6th largest country by land area but has a population of only 26 million people, making it one of the least densely populated countries."},
-            {"title": "Great Barrier Reef", "content": "The Great Barrier Reef is the world's largest coral reef system and can be seen from space - it's larger than the Great Wall of China!"}
-        ],
-        'egypt': [
-            {"title": "Ancient Wonder", "content": "The Great Pyramid of Giza was the tallest man-made structure in the world for over 3,800 years until the Eiffel Tower was built."},
-            {"title": "Nile Lifeline", "content": "The Nile River, flowing through Egypt, is the longest river in the world at 4,135 miles and has been Egypt's lifeline for over 5,000 years."},
-            {"title": "Hieroglyphic Legacy", "content": "Ancient Egyptians used over 700 different hieroglyphic symbols, and the Rosetta Stone was the key to deciphering this ancient writing system."}
-        ],
-        'india': [
-            {"title": "Language Diversity", "content": "India recognizes 22 official languages and has over 1,600 spoken languages, making it one of the most linguistically diverse countries on Earth."},
-            {"title": "Spice Origin", "content": "India is known as the 'Spice Bowl of the World' and produces 70% of the world's spices, including black pepper, cardamom, and turmeric."},
-            {"title": "Chess Birthplace", "content": "Chess was invented in India around the 6th century AD, originally called 'Chaturanga,' meaning 'four divisions of the army.'"}
-        ]
-    }
-    
     country_lower = country_name.lower()
     
     # Return specific facts if available
-    if country_lower in country_facts:
-        return country_facts[country_lower], "Enhanced Knowledge Base"
+    facts = COUNTRY_FACTS.get(country_lower)
+    if facts:
+        return facts, "Enhanced Knowledge Base"
     
     # Generate contextual facts for other countries
     generic_patterns = [
-        {
-            "title": "Geographic Uniqueness",
-            "content": f"{country_name} has distinctive geographical features that have shaped its culture, climate, and way of life throughout history."
-        },
-        {
-            "title": "Cultural Heritage",
-            "content": f"The people of {country_name} have developed unique traditions, languages, and customs that reflect their rich historical heritage and regional influences."
-        },
-        {
-            "title": "Global Contribution",
-            "content": f"{country_name} has made significant contributions to world culture, science, art, or international relations that continue to influence global society today."
-        }
+        {"title": title, "content": template.format(country=country_name)}
+        for title, template in GENERIC_FACT_TEMPLATES
     ]
     
     return generic_patterns, "Enhanced Knowledge Base"
@@ -232,11 +364,95 @@ def try_creative_generation(country_name):
     
     return None, None
 
+def generate_fallback_facts(country_name):
+    """Last-resort facts used when every provider has failed"""
+    return [
+        {
+            "title": "Geographic Location",
+            "content": f"{country_name} is a unique nation with its own distinct geography and borders."
+        },
+        {
+            "title": "Cultural Heritage",
+            "content": f"{country_name} has a rich cultural heritage that reflects its history and people."
+        },
+        {
+            "title": "Modern Significance",
+            "content": f"{country_name} continues to play an important role in today's global community."
+        }
+    ]
+
+def generate_facts_batch(countries):
+    """Generate facts for several countries, sending model prompts as one batch"""
+    if not isinstance(countries, list) or not countries:
+        return jsonify({"error": "Countries must be a non-empty list"}), 400
+    
+    country_names = [c.strip() for c in countries if isinstance(c, str)]
+    if len(country_names) != len(countries) or not all(country_names):
+        return jsonify({"error": "Every country name must be a non-empty string"}), 400
+    
+    if len(country_names) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} countries can be requested at once"}), 400
+    
+    logger.info(f"🌍 Generating facts for {len(country_names)} countries")
+    
+    cache_keys = [make_cache_key('facts', country_name) for country_name in country_names]
+    hf_results = []
+    for country_name, key in zip(country_names, cache_keys):
+        # Curated facts need no model call, so resolve them up front
+        curated = COUNTRY_FACTS.get(country_name.lower())
+        hf_results.append((curated, "Enhanced Knowledge Base") if curated else cache_get(key) or (None, None))
+    
+    # Send each distinct country without curated facts or a cached model
+    # response to the provider once, however often it appears in the request
+    misses = {}
+    for i, (facts, _) in enumerate(hf_results):
+        if not facts:
+            misses.setdefault(cache_keys[i], []).append(i)
+    
+    if misses:
+        miss_keys = list(misses)
+        batch_results = try_huggingface_free_batch([country_names[misses[key][0]] for key in miss_keys])
+        for key, (facts, model_used, matched) in zip(miss_keys, batch_results):
+            for i in misses[key]:
+                hf_results[i] = (facts, model_used)
+            # Padding means the model gave nothing usable; retry it next time
+            if facts and matched == 3:
+                cache_put(key, (freeze_facts(facts), model_used))
+    
+    results = []
+    for country_name, (facts, model_used) in zip(country_names, hf_results):
+        if not facts:
+            facts, model_used = try_creative_generation(country_name)
+        
+        if facts and len(facts) > 0:
+            results.append({
+                "country": country_name,
+                "facts": facts,
+                "model_used": model_used,
+                "status": "success"
+            })
+        else:
+            results.append({
+                "country": country_name,
+                "facts": generate_fallback_facts(country_name),
+                "model_used": "Fallback System",
+                "status": "fallback"
+            })
+    
+    return jsonify({
+        "results": results,
+        "status": "success"
+    })
+
 @app.route('/generate-facts', methods=['POST'])
 def generate_facts():
     """Generate 3 interesting facts about a country using multiple LLM providers"""
     try:
         data = request.get_json()
+        
+        if 'countries' in data:
+            return generate_facts_batch(data.get('countries'))
+        
         country_name = data.get('country', '').strip()
         
         if not country_name:
@@ -244,8 +460,25 @@ def generate_facts():
         
         logger.info(f"🌍 Generating facts for: {country_name}")
         
-        # Try HuggingFace free inference first
-        facts, model_used = try_huggingface_free(country_name)
+        # Curated facts need no model call, so serve them straight away
+        curated = COUNTRY_FACTS.get(country_name.lower())
+        if curated:
+            return jsonify({
+                "facts": curated,
+                "model_used": "Enhanced Knowledge Base",
+                "status": "success"
+            })
+        
+        # Try HuggingFace free inference first, reusing a cached response if any
+        cache_key = make_cache_key('facts', country_name)
+        cached = cache_get(cache_key)
+        if cached:
+            facts, model_used = cached
+        else:
+            facts, model_used, matched = try_huggingface_free(country_name)
+            # Padding means the model gave nothing usable; retry it next time
+            if facts and matched == 3:
+                cache_put(cache_key, (freeze_facts(facts), model_used))
         
         if not facts:
             # Fallback to knowledge base
@@ -261,22 +494,8 @@ def generate_facts():
         else:
             logger.error("❌ All LLM providers failed")
             # Return fallback facts
-            fallback_facts = [
-                {
-                    "title": "Geographic Location",
-                    "content": f"{country_name} is a unique nation with its own distinct geography and borders."
-                },
-                {
-                    "title": "Cultural Heritage",
-                    "content": f"{country_name} has a rich cultural heritage that reflects its history and people."
-                },
-                {
-                    "title": "Modern Significance",
-                    "content": f"{country_name} continues to play an important role in today's global community."
-                }
-            ]
             return jsonify({
-                "facts": fallback_facts,
+                "facts": generate_fallback_facts(country_name),
                 "model_used": "Fallback System",
                 "status": "fallback"
             })
@@ -298,8 +517,15 @@ def chat():
         
         logger.info(f"💬 Chat question about {country_name}: {question}")
         
-        # Try HuggingFace for chat first
-        facts, model_used = try_huggingface_chat(country_name, question)
+        # Try HuggingFace for chat first, reusing a cached response if any
+        cache_key = make_cache_key('chat', country_name, question)
+        cached = cache_get(cache_key)
+        if cached:
+            facts, model_used = cached
+        else:
+            facts, model_used = try_huggingface_chat(country_name, question)
+            if facts:
+                cache_put(cache_key, (facts, model_used))
         
         if not facts:
             # Fallback to knowledge base for chat responses
@@ -329,18 +555,14 @@ def try_huggingface_chat(country_name, question):
         
         payload = {
             "inputs": prompt,
-            "parameters": {
-                "max_length": 150,
-                "temperature": 0.7,
-                "do_sample": True
-            }
+            "parameters": CHAT_GENERATION_PARAMETERS
         }
         
         logger.info("🤗 Trying HuggingFace for chat...")
         
         # Try DialoGPT for conversational responses
-        url = "https://api-inference.huggingface.co/models/microsoft/DialoGPT-medium"
-        response = requests.post(url, json=payload, timeout=20)
+        url = HF_DIALOGPT_URL
+        response = HTTP_SESSION.post(url, json=payload, timeout=CHAT_TIMEOUT)
         
         if response.status_code == 200:
             data = response.json()
@@ -356,6 +578,27 @@ def try_huggingface_chat(country_name, question):
     
     return None, None
 
+# Simple knowledge base used by try_simple_chat: country -> (capital, language, currency)
+COUNTRY_INFO = MappingProxyType({
+    'japan': ('Tokyo', 'Japanese', 'Japanese Yen'),
+    'france': ('Paris', 'French', 'Euro'),
+    'germany': ('Berlin', 'German', 'Euro'),
+    'italy': ('Rome', 'Italian', 'Euro'),
+    'spain': ('Madrid', 'Spanish', 'Euro'),
+    'brazil': ('Brasília', 'Portuguese', 'Brazilian Real'),
+    'canada': ('Ottawa', 'English and French', None),
+    'australia': ('Canberra', 'English', None),
+    'india': ('New Delhi', 'Hindi and English', None),
+    'egypt': ('Cairo', 'Arabic', None),
+    'china': ('Beijing', 'Mandarin Chinese', None),
+    'russia': ('Moscow', 'Russian', None),
+    'uk': ('London', None, None),
+    'usa': ('Washington D.C.', None, None),
+    'mexico': ('Mexico City', None, None),
+    'argentina': ('Buenos Aires', None, None)
+})
+_NO_COUNTRY_INFO = (None, None, None)
+
 def try_simple_chat(country_name, question):
     """Simple knowledge-based chat responses"""
     logger.info("Using simple knowledge-based responses...")
@@ -364,14 +607,7 @@ def try_simple_chat(country_name, question):
     
     # Simple knowledge base
     if 'capital' in question_lower:
-        capitals = {
-            'japan': 'Tokyo', 'france': 'Paris', 'germany': 'Berlin', 'italy': 'Rome',
-            'spain': 'Madrid', 'brazil': 'Brasília', 'canada': 'Ottawa', 
-            'australia': 'Canberra', 'india': 'New Delhi', 'egypt': 'Cairo',
-            'china': 'Beijing', 'russia': 'Moscow', 'uk': 'London', 'usa': 'Washington D.C.',
-            'mexico': 'Mexico City', 'argentina': 'Buenos Aires'
-        }
-        capital = capitals.get(country_name.lower())
+        capital = COUNTRY_INFO.get(country_name.lower(), _NO_COUNTRY_INFO)[0]
         if capital:
             return f"The capital of {country_name} is {capital}.", "Knowledge Base"
     
@@ -379,22 +615,12 @@ def try_simple_chat(country_name, question):
         return f"{country_name} has a significant population that varies over time. For the most current figures, I'd recommend checking recent census data.", "Knowledge Base"
     
     elif 'language' in question_lower:
-        languages = {
-            'japan': 'Japanese', 'france': 'French', 'germany': 'German', 
-            'italy': 'Italian', 'spain': 'Spanish', 'brazil': 'Portuguese',
-            'china': 'Mandarin Chinese', 'russia': 'Russian', 'egypt': 'Arabic',
-            'india': 'Hindi and English', 'australia': 'English', 'canada': 'English and French'
-        }
-        language = languages.get(country_name.lower())
+        language = COUNTRY_INFO.get(country_name.lower(), _NO_COUNTRY_INFO)[1]
         if language:
             return f"The primary language spoken in {country_name} is {language}.", "Knowledge Base"
     
     elif 'currency' in question_lower:
-        currencies = {
-            'japan': 'Japanese Yen', 'france': 'Euro', 'germany': 'Euro',
-            'italy': 'Euro', 'spain': 'Euro', 'brazil': 'Brazilian Real'
-        }
-        currency = currencies.get(country_name.lower())
+        currency = COUNTRY_INFO.get(country_name.lower(), _NO_COUNTRY_INFO)[2]
         if currency:
             return f"The currency used in {country_name} is the {currency}.", "Knowledge Base"
     
@@ -423,7 +649,9 @@ if __name__ == '__main__':
     print("   2. Enhanced Knowledge Base (curated facts)")
     print("   3. Simple Knowledge Base (always available)")
     print("")
-    print("💡 Install requirements: pip install flask flask-cors requests")
+    print("💡 Install requirements: pip install -r requirements.txt")
+    print("🏭 For production, run under Gunicorn instead of the dev server:")
+    print("   gunicorn -k gthread -w 4 --threads 16 -b 0.0.0.0:5002 deepseek_backend:app")
     print("")
     
-    app.run(debug=True, host='0.0.0.0', port=5002)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=5002)
\ No newline at end of file